@@ -57,6 +57,16 @@ class BitcoindTest(FlorestaTestFramework):
         self.assertEqual(response["bestblockhash"], BitcoindTest.expected_blockhash)
         self.assertTrue(response["difficulty"] > 0)
 
+        # Bitcoin Core also accepts many requests in a
+        # single HTTP request (a JSON-RPC batch), with the
+        # results returned in the same order of the calls
+        height, blockhash = self.bitcoind.rpc.perform_batch_request(
+            [("getblockcount", []), ("getbestblockhash", [])]
+        )
+
+        self.assertEqual(height, BitcoindTest.expected_height)
+        self.assertEqual(blockhash, BitcoindTest.expected_blockhash)
+
         self.stop()
 
 
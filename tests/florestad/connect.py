@@ -7,9 +7,8 @@ the utreexod node is connected to the florestad node.
 """
 
 from test_framework import FlorestaTestFramework
-import time
 
-SLEEP_TIME = 10
+CONNECT_TIMEOUT = 10
 
 
 class CliConnectTest(FlorestaTestFramework):
@@ -33,12 +32,14 @@ class CliConnectTest(FlorestaTestFramework):
         self.log("=== Starting floresta")
         self.run_node(self.florestad)
 
-        time.sleep(SLEEP_TIME)  # Give some time for the nodes to start
-
         # Check whether the utreexod is connected to florestad
         self.log("=== Checking connection")
-        res = self.utreexod.rpc.get_peerinfo()
-        self.assertEqual(len(res), 1)
+        self.assertTrue(
+            self.poll_until(
+                lambda: len(self.utreexod.rpc.get_peerinfo()) == 1,
+                timeout=CONNECT_TIMEOUT,
+            )
+        )
 
         # Stop the nodes
         self.log("=== Stopping nodes")
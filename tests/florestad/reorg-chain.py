@@ -8,10 +8,16 @@ accumulator to make sure they are the same.
 """
 
 import re
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 from test_framework import FlorestaTestFramework
 
+CONNECT_TIMEOUT = 10
+SYNC_TIMEOUT = 60
+
+# User agent advertised by utreexod
+UTREEXOD_USER_AGENT = re.compile(r"/btcwire:\d+\.\d+\.\d+/utreexod:\d+\.\d+\.\d+/")
+
 
 class ChainReorgTest(FlorestaTestFramework):
     """Test the reorganization of the chain in florestad when using utreexod to mine blocks."""
@@ -30,63 +36,106 @@ class ChainReorgTest(FlorestaTestFramework):
             ],
         )
 
-    def run_test(self):
-        # Start the nodes
-        self.run_node(self.florestad)
-        self.run_node(self.utreexod)
-
-        # Mine some blocks with utreexod
-        self.log("=== Mining blocks with utreexod")
-        self.utreexod.rpc.generate(10)
-
-        self.log("=== Connect floresta to utreexod")
-        host = self.florestad.get_host()
-        port = self.utreexod.get_port("p2p")
-        self.florestad.rpc.addnode(
-            f"{host}:{port}", command="onetry", v2transport=False
+    def is_connected_to_utreexod(self) -> bool:
+        """Check if florestad has a utreexod peer"""
+        return any(
+            UTREEXOD_USER_AGENT.fullmatch(peer["user_agent"])
+            for peer in self.florestad.rpc.get_peerinfo()
         )
-        time.sleep(5)
 
-        self.log("=== Waiting for floresta to connect to utreexod.rpc...")
-        peer_info = self.florestad.rpc.get_peerinfo()
-        self.assertMatch(
-            peer_info[0]["user_agent"],
-            re.compile(r"/btcwire:\d+\.\d+\.\d+/utreexod:\d+\.\d+\.\d+/"),
+    def wait_for_peer_connection(self):
+        """Wait until florestad is connected to utreexod"""
+        self.assertTrue(
+            self.poll_until(self.is_connected_to_utreexod, timeout=CONNECT_TIMEOUT)
         )
 
-        self.log("=== Wait for the nodes to sync...")
-        time.sleep(20)
-
-        self.log("=== Check that floresta has the same chain as utreexod.rpc...")
-        floresta_chain = self.florestad.rpc.get_blockchain_info()
-        utreexo_chain = self.utreexod.rpc.get_blockchain_info()
-        self.assertEqual(floresta_chain["best_block"], utreexo_chain["bestblockhash"])
-        self.assertEqual(floresta_chain["height"], utreexo_chain["blocks"])
-
-        self.log("=== Get a block hash from utreexod to invalidate")
-        hash = self.utreexod.rpc.get_blockhash(5)
-        self.utreexod.rpc.invalidate_block(hash)
-
-        self.log("=== Mining alternative chain with utreexod.rpc...")
-        self.utreexod.rpc.generate(10)
-
-        self.log("=== Wait for the nodes to sync")
-        time.sleep(20)
-
-        self.log("=== Check that floresta has switched to the new chain")
-        floresta_chain = self.florestad.rpc.get_blockchain_info()
-        utreexo_chain = self.utreexod.rpc.get_blockchain_info()
-        self.assertEqual(floresta_chain["best_block"], utreexo_chain["bestblockhash"])
-        self.assertEqual(floresta_chain["height"], utreexo_chain["blocks"])
+    def get_chains(self, executor: ThreadPoolExecutor) -> tuple[dict, dict]:
+        """Get the blockchain info of florestad and utreexod concurrently"""
+        floresta_chain = executor.submit(self.florestad.rpc.get_blockchain_info)
+        utreexo_chain = executor.submit(self.utreexod.rpc.get_blockchain_info)
+        return floresta_chain.result(), utreexo_chain.result()
+
+    def get_roots(self, executor: ThreadPoolExecutor, blockhash: str) -> tuple:
+        """Get the accumulator roots of florestad and utreexod concurrently"""
+        floresta_roots = executor.submit(self.florestad.rpc.get_roots)
+        utreexo_roots = executor.submit(self.utreexod.rpc.get_utreexo_roots, blockhash)
+        return floresta_roots.result(), utreexo_roots.result()["roots"]
+
+    def is_synced(self, executor: ThreadPoolExecutor) -> bool:
+        """Check if florestad has the same tip as utreexod"""
+        floresta_chain, utreexo_chain = self.get_chains(executor)
+        return (
+            floresta_chain["best_block"] == utreexo_chain["bestblockhash"]
+            and floresta_chain["height"] == utreexo_chain["blocks"]
+        )
 
-        self.log("=== Compare the accumulator roots for each node")
-        floresta_roots = self.florestad.rpc.get_roots()
-        utreexo_roots = self.utreexod.rpc.get_utreexo_roots(
-            utreexo_chain["bestblockhash"]
+    def wait_for_sync(self, executor: ThreadPoolExecutor):
+        """Wait until florestad catches up with utreexod's tip"""
+        self.assertTrue(
+            self.poll_until(lambda: self.is_synced(executor), timeout=SYNC_TIMEOUT)
         )
-        self.assertEqual(floresta_roots, utreexo_roots["roots"])
 
-        self.stop()
+    def run_test(self):
+        # Used to query both nodes at the same time, so each
+        # check costs one round-trip instead of two
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Start the nodes
+            self.run_node(self.florestad)
+            self.run_node(self.utreexod)
+
+            # Mine some blocks with utreexod
+            self.log("=== Mining blocks with utreexod")
+            self.utreexod.rpc.generate(10)
+
+            self.log("=== Connect floresta to utreexod")
+            host = self.florestad.get_host()
+            port = self.utreexod.get_port("p2p")
+            self.florestad.rpc.addnode(
+                f"{host}:{port}", command="onetry", v2transport=False
+            )
+
+            self.log("=== Waiting for floresta to connect to utreexod.rpc...")
+            self.wait_for_peer_connection()
+            peer_info = self.florestad.rpc.get_peerinfo()
+            self.assertMatch(
+                peer_info[0]["user_agent"],
+                UTREEXOD_USER_AGENT,
+            )
+
+            self.log("=== Wait for the nodes to sync...")
+            self.wait_for_sync(executor)
+
+            self.log("=== Check that floresta has the same chain as utreexod.rpc...")
+            floresta_chain, utreexo_chain = self.get_chains(executor)
+            self.assertEqual(
+                floresta_chain["best_block"], utreexo_chain["bestblockhash"]
+            )
+            self.assertEqual(floresta_chain["height"], utreexo_chain["blocks"])
+
+            self.log("=== Get a block hash from utreexod to invalidate")
+            hash = self.utreexod.rpc.get_blockhash(5)
+            self.utreexod.rpc.invalidate_block(hash)
+
+            self.log("=== Mining alternative chain with utreexod.rpc...")
+            self.utreexod.rpc.generate(10)
+
+            self.log("=== Wait for the nodes to sync")
+            self.wait_for_sync(executor)
+
+            self.log("=== Check that floresta has switched to the new chain")
+            floresta_chain, utreexo_chain = self.get_chains(executor)
+            self.assertEqual(
+                floresta_chain["best_block"], utreexo_chain["bestblockhash"]
+            )
+            self.assertEqual(floresta_chain["height"], utreexo_chain["blocks"])
+
+            self.log("=== Compare the accumulator roots for each node")
+            floresta_roots, utreexo_roots = self.get_roots(
+                executor, utreexo_chain["bestblockhash"]
+            )
+            self.assertEqual(floresta_roots, utreexo_roots)
+
+            self.stop()
 
 
 if __name__ == "__main__":
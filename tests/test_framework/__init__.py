@@ -10,22 +10,30 @@ The difference is that `florestad` will run under a `cargo run` subprocess, whic
 `add_node_settings`.
 """
 
+# pylint: disable=too-many-lines
+
 import os
+import atexit
+import functools
 import re
 import sys
-import copy
 import time
-import random
 import socket
 import signal
 import contextlib
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Literal, Pattern, TextIO
+from subprocess import TimeoutExpired
+from typing import Any, Callable, Dict, List, Literal, Pattern, TextIO
 
+from requests import Session
+from requests.adapters import HTTPAdapter
 from test_framework.crypto.pkcs8 import (
     create_pkcs8_private_key,
     create_pkcs8_self_signed_certificate,
 )
+from test_framework.daemon.base import BaseDaemon
 from test_framework.daemon.bitcoin import BitcoinDaemon
 from test_framework.daemon.floresta import FlorestaDaemon
 from test_framework.daemon.utreexo import UtreexoDaemon
@@ -48,6 +56,23 @@ class Node:
         self.rpc = rpc
         self.rpc_config = rpc_config
         self.variant = variant
+        self._http_session = None
+
+    @property
+    def http_session(self) -> Session:
+        """
+        Get the HTTP session used by the RPC clients of this node,
+        creating it on first use. It keeps the connections to the
+        RPC server open between calls, and lives as long as the node,
+        so it is shared by the clients created when the node restarts
+        (connections dropped by a stopped daemon are replaced on use).
+        """
+        if self._http_session is None:
+            self._http_session = Session()
+            self._http_session.mount(
+                "http://", HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            )
+        return self._http_session
 
     def start(self):
         """
@@ -58,17 +83,45 @@ class Node:
         self.daemon.start()
         self.rpc.wait_for_connections(opened=True)
 
-    def stop(self):
+    def stop(self, timeout: float = 30):
         """
         Stop the node.
+
+        If the daemon does not close its ports and exit within `timeout`
+        seconds after the stop request, it is killed (see `Node.kill_all`),
+        so a hanging daemon can not block the test forever.
         """
         if self.daemon.is_running:
+            deadline = time.monotonic() + timeout
             response = self.rpc.stop()
-            self.rpc.wait_for_connections(opened=False)
-            self.daemon.process.wait()
+            try:
+                self.rpc.wait_for_connections(opened=False, timeout=timeout)
+                self.daemon.wait(max(0, deadline - time.monotonic()))
+            except (TimeoutError, TimeoutExpired):
+                Node.kill_all([self])
             return response
         return None
 
+    @staticmethod
+    def kill_all(nodes: List["Node"], timeout: float = 10):
+        """
+        Send a SIGTERM to the daemons of the given nodes that are still
+        running and reap them. The daemons that do not exit in `timeout`
+        seconds get a SIGKILL.
+        """
+        nodes = [node for node in nodes if node.daemon.is_running]
+        for node in nodes:
+            node.send_kill_signal("SIGTERM")
+
+        daemons = [node.daemon for node in nodes]
+        try:
+            BaseDaemon.wait_all(daemons, timeout)
+        except TimeoutExpired:
+            for node in nodes:
+                if node.daemon.is_running:
+                    node.send_kill_signal("SIGKILL")
+            BaseDaemon.wait_all(daemons)
+
     def get_host(self) -> str:
         """
         Get the host address of the node.
@@ -196,16 +249,14 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
             """Enter the context manager."""
             return self
 
-        def __exit__(self, exc_type, exc_value, traceback):
+        def __exit__(self, exc_type, exc_value, tb):
             """Exit the context manager and check if the expected exception was raised."""
             if exc_type is None:
-                self.test_framework.stop_all_nodes()
-                trace = traceback.format_exc()
-                message = f"{self.expected_exception} was not raised"
-                raise AssertionError(f"{message}: {trace}")
+                self.test_framework.stop()
+                raise AssertionError(f"{self.expected_exception} was not raised")
 
             if not issubclass(exc_type, self.expected_exception):
-                trace = traceback.format_exc()
+                trace = "".join(traceback.format_exception(exc_type, exc_value, tb))
                 message = f"Expected {self.expected_exception} but got {exc_type}"
                 raise AssertionError(f"{message}: {trace}")
 
@@ -219,6 +270,7 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
         Do not override this method. Instead, override the set_test_params() method
         """
         self._nodes = []
+        self._log_path = None
 
     # pylint: disable=R0801
     def log(self, msg: str):
@@ -237,6 +289,12 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
 
         This should not be overridden by the subclass test scripts.
         """
+        # If the test process is interrupted (SIGTERM, SIGINT) or exits
+        # through a path that skips the regular `stop`, make sure no daemon
+        # is left running (and holding its ports) after we are gone.
+        atexit.register(self.kill_running_nodes)
+        signal.signal(signal.SIGTERM, FlorestaTestFramework.exit_on_signal)
+
         try:
             self.set_test_params()
             self.run_test()
@@ -263,6 +321,32 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
                 f"Process with pids {', '.join(processes)} failed to start: {err}"
             ) from err
 
+    @staticmethod
+    def exit_on_signal(signum: int, _frame):
+        """
+        Turn a termination signal into a `SystemExit`, so the
+        `atexit` handlers run before the test process exits.
+        """
+        raise SystemExit(128 + signum)
+
+    def kill_running_nodes(self, timeout: int = 10):
+        """
+        Send a SIGTERM to every daemon that is still running and wait
+        for it to exit. If it does not exit in `timeout` seconds, send
+        a SIGKILL.
+        """
+        running = []
+        for node in self._nodes:
+            # The daemon process is not set if the node was never started
+            with contextlib.suppress(ValueError):
+                if node.daemon.is_running:
+                    self.log(
+                        f"Killing '{node.variant}' (pid {node.daemon.process.pid})"
+                    )
+                    running.append(node)
+
+        Node.kill_all(running, timeout)
+
     # Should be overridden by individual tests
     def set_test_params(self):
         """
@@ -277,10 +361,11 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
         raise NotImplementedError
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_integration_test_dir():
         """
         Get path for florestad used in integration tests, generally set on
-        $FLORESTA_TEMP_DIR/binaries
+        $FLORESTA_TEMP_DIR/binaries. It is read once per test run.
         """
         if os.getenv("FLORESTA_TEMP_DIR") is None:
             raise RuntimeError(
@@ -289,42 +374,57 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
             )
         return os.getenv("FLORESTA_TEMP_DIR")
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get_binaries_dir() -> str:
+        """
+        Get the folder with the daemon executables, at
+        $FLORESTA_TEMP_DIR/binaries. It is resolved once per test run.
+        """
+        tempdir = str(FlorestaTestFramework.get_integration_test_dir())
+        return os.path.normpath(os.path.join(tempdir, "binaries"))
+
     @staticmethod
     def create_data_dirs(data_dir: str, base_name: str, nodes: int) -> list[str]:
         """
         Create the data directories for any nodes to be used in the test.
         """
-        paths = []
-        for i in range(nodes):
-            p = os.path.join(data_dir, "data", base_name, f"node-{i}")
+        base = os.path.join(data_dir, "data", base_name)
+        paths = [os.path.join(base, f"node-{i}") for i in range(nodes)]
+        for p in paths:
             os.makedirs(p, exist_ok=True)
-            paths.append(p)
 
         return paths
 
     @staticmethod
-    def get_available_random_port(start: int, end: int = 65535):
-        """Get an available random port in the range [start, end]"""
-        while True:
-            port = random.randint(start, end)
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                # Check if the port is available
-                if s.connect_ex(("127.0.0.1", port)) != 0:
-                    return port
+    def get_available_port() -> int:
+        """
+        Get an available port on localhost, assigned by the OS.
+
+        Binding to port 0 makes the kernel pick a free ephemeral port,
+        so there is no need to probe random ports until one is free.
+        The socket is closed right after, so the daemon can bind to it.
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            return s.getsockname()[1]
 
     def get_test_log_path(self) -> str:
         """
         Get the path for the test name log file, which is the class name in lowercase.
         This is used to create a log file for the test.
         """
-        tempdir = str(FlorestaTestFramework.get_integration_test_dir())
+        if self._log_path is None:
+            tempdir = str(FlorestaTestFramework.get_integration_test_dir())
+
+            # Get the class's base filename
+            filename = sys.modules[self.__class__.__module__].__file__
+            filename = os.path.basename(filename)
+            filename = filename.replace(".py", "")
 
-        # Get the class's base filename
-        filename = sys.modules[self.__class__.__module__].__file__
-        filename = os.path.basename(filename)
-        filename = filename.replace(".py", "")
+            self._log_path = os.path.join(tempdir, "logs", f"{filename}.log")
 
-        return os.path.join(tempdir, "logs", f"{filename}.log")
+        return self._log_path
 
     def create_tls_key_cert(self) -> tuple[str, str]:
         """
@@ -387,9 +487,10 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
             )
             datadir = data_dir_arg.split("=", 1)[1]
 
-        if not os.path.exists(datadir):
-            self.log(f"Creating data directory for {data_dir_arg} in {datadir}")
-            os.makedirs(datadir, exist_ok=True)
+        # Just try to create it, instead of checking for its existence first
+        with contextlib.suppress(FileExistsError):
+            os.makedirs(datadir)
+            self.log(f"Created data directory for {data_dir_arg} in {datadir}")
 
     # pylint: disable=too-many-positional-arguments,too-many-arguments
     def setup_florestad_daemon(
@@ -405,21 +506,22 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
         daemon.create(target=targetdir)
         default_args = []
 
+        # The options given by the test, to not override them
+        present = {arg.split("=", 1)[0] for arg in extra_args}
+
         # Add a default data-dir if not set
         self.create_data_dir_for_daemon(
             "--data-dir", default_args, extra_args, tempdir, testname
         )
 
         # Add a random rpc address if not set
-        if not self.is_option_set(extra_args, "--rpc-address"):
-            port = FlorestaTestFramework.get_available_random_port(18443, 19443)
+        if "--rpc-address" not in present:
+            port = FlorestaTestFramework.get_available_port()
             default_args.append(f"--rpc-address=127.0.0.1:{port}")
 
         # Add a random electrum address if not set
-        if not self.is_option_set(extra_args, "--electrum-address"):
-            electrum_port = FlorestaTestFramework.get_available_random_port(
-                20001, 21001
-            )
+        if "--electrum-address" not in present:
+            electrum_port = FlorestaTestFramework.get_available_port()
             default_args.append(f"--electrum-address=127.0.0.1:{electrum_port}")
 
         # configure (or not) the ssl keys
@@ -430,16 +532,13 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
             default_args.append(f"--tls-cert-path={cert}")
 
             # Add a random tls electrum address if not set
-            if not self.is_option_set(extra_args, "--electrum-address-tls"):
-                tls_electrum_port = FlorestaTestFramework.get_available_random_port(
-                    20002, 21002
-                )
+            if "--electrum-address-tls" not in present:
+                tls_electrum_port = FlorestaTestFramework.get_available_port()
                 default_args.append(
                     f"--electrum-address-tls=127.0.0.1:{tls_electrum_port}"
                 )
 
-        daemon.add_daemon_settings(default_args)
-        daemon.add_daemon_settings(extra_args)
+        daemon.add_daemon_settings([*default_args, *extra_args])
         return daemon
 
     # pylint: disable=too-many-arguments,too-many-positional-arguments
@@ -456,26 +555,27 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
         daemon.create(target=targetdir)
         default_args = []
 
+        # The options given by the test, to not override them
+        present = {arg.split("=", 1)[0] for arg in extra_args}
+
         # Add a default data-dir if not set
         self.create_data_dir_for_daemon(
             "--datadir", default_args, extra_args, tempdir, testname
         )
 
         # Add a default p2p listen address if not set
-        if not self.is_option_set(extra_args, "--listen"):
-            port = FlorestaTestFramework.get_available_random_port(18444, 19444)
+        if "--listen" not in present:
+            port = FlorestaTestFramework.get_available_port()
             default_args.append(f"--listen=127.0.0.1:{port}")
 
         # Add a default rpc listen address if not set
-        if not self.is_option_set(extra_args, "--rpclisten"):
-            port = FlorestaTestFramework.get_available_random_port(18443, 19443)
+        if "--rpclisten" not in present:
+            port = FlorestaTestFramework.get_available_port()
             default_args.append(f"--rpclisten=127.0.0.1:{port}")
 
-        if not self.is_option_set(extra_args, "--electrumlisteners"):
+        if "--electrumlisteners" not in present:
             # Add a default electrum address if not set
-            electrum_port = FlorestaTestFramework.get_available_random_port(
-                20001, 21001
-            )
+            electrum_port = FlorestaTestFramework.get_available_port()
             default_args.append(f"--electrumlisteners=127.0.0.1:{electrum_port}")
 
         # configure (or not) the ssl keys
@@ -487,14 +587,11 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
             default_args.append(f"--rpccert={cert}")
 
             # Add a random tls electrum address if not set
-            if not self.is_option_set(extra_args, "--tlselectrumlisteners"):
-                tls_electrum_port = FlorestaTestFramework.get_available_random_port(
-                    20002, 21002
-                )
+            if "--tlselectrumlisteners" not in present:
+                tls_electrum_port = FlorestaTestFramework.get_available_port()
                 default_args.append(f"--tlselectrumlisteners={tls_electrum_port}")
 
-        daemon.add_daemon_settings(default_args)
-        daemon.add_daemon_settings(extra_args)
+        daemon.add_daemon_settings([*default_args, *extra_args])
         return daemon
 
     # pylint: disable=too-many-arguments,too-many-positional-arguments
@@ -510,27 +607,37 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
         daemon.create(target=targetdir)
         default_args = []
 
+        # The options given by the test, to not override them
+        present = {arg.split("=", 1)[0] for arg in extra_args}
+
         # Add a default data-dir if not set
         self.create_data_dir_for_daemon(
             "-datadir", default_args, extra_args, tempdir, testname
         )
 
-        if not self.is_option_set(extra_args, "-bind"):
+        if "-bind" not in present:
             # Add a default rpc bind address if not set
-            port = FlorestaTestFramework.get_available_random_port(18445, 19445)
+            port = FlorestaTestFramework.get_available_port()
             default_args.append(f"-bind=127.0.0.1:{port}")
 
-        if not self.is_option_set(extra_args, "-rpcbind"):
+        if "-rpcbind" not in present:
             # Add a default rpc bind address if not set
-            port = FlorestaTestFramework.get_available_random_port(20443, 21443)
+            port = FlorestaTestFramework.get_available_port()
 
             # option -rpcbind is ignored if -rpcallowip isnt specified,
             # refusing to allow everyone to connect
             default_args.append("-rpcallowip=127.0.0.1")
             default_args.append(f"-rpcbind=127.0.0.1:{port}")
 
-        daemon.add_daemon_settings(default_args)
-        daemon.add_daemon_settings(extra_args)
+        # A regtest chain is tiny, so the smallest database cache is enough
+        # and there is no need to spawn the script verification threads
+        if "-dbcache" not in present:
+            default_args.append("-dbcache=4")
+
+        if "-par" not in present:
+            default_args.append("-par=1")
+
+        daemon.add_daemon_settings([*default_args, *extra_args])
         return daemon
 
     # pylint: disable=dangerous-default-value
@@ -550,7 +657,7 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
         # /tmp/floresta-integration-tests.$(git rev-parse HEAD).
         # So, check for it first before define the florestad path.
         tempdir = str(FlorestaTestFramework.get_integration_test_dir())
-        targetdir = os.path.normpath(os.path.join(tempdir, "binaries"))
+        targetdir = FlorestaTestFramework.get_binaries_dir()
 
         # Daemon can be a variant of Floresta, Utreexo or Bitcoin Core
         testname = self.__class__.__name__.lower()
@@ -562,22 +669,26 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
         if variant == "florestad":
             setup_daemon = getattr(self, "setup_florestad_daemon")
             daemon = setup_daemon(targetdir, tempdir, testname, extra_args, tls)
-            rpcserver = copy.deepcopy(florestad_rpc_server)
+            rpcserver = florestad_rpc_server
         elif variant == "utreexod":
             setup_daemon = getattr(self, "setup_utreexod_daemon")
             daemon = setup_daemon(targetdir, tempdir, testname, extra_args, tls)
-            rpcserver = copy.deepcopy(utreexod_rpc_server)
+            rpcserver = utreexod_rpc_server
         elif variant == "bitcoind":
             setup_daemon = getattr(self, "setup_bitcoind_daemon")
             daemon = setup_daemon(targetdir, tempdir, testname, extra_args)
-            rpcserver = copy.deepcopy(bitcoind_rpc_server)
+            rpcserver = bitcoind_rpc_server
         else:
             raise ValueError(
                 f"Unsupported variant: {variant}. Use 'florestad', 'utreexod' or 'bitcoind'."
             )
 
+        # Only "ports" is nested (and later replaced by the detected ports),
+        # so a shallow copy of it is enough to keep the constants untouched
+        rpc_config = {**rpcserver, "ports": {**rpcserver["ports"]}}
+
         # Node has been setup, now we can create the Node object
-        node = Node(daemon, rpc=None, rpc_config=rpcserver, variant=variant)
+        node = Node(daemon, rpc=None, rpc_config=rpc_config, variant=variant)
         self._nodes.append(node)
         return node
 
@@ -592,46 +703,47 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
             )
         return self._nodes[index]
 
-    # pylint: disable=too-many-branches
+    # Log lines announcing the ports of each daemon, combined in a single
+    # pattern per daemon. Each alternative captures the port in a group
+    # named after it (with `_` in place of `-`), so a line is searched
+    # once and `match.lastgroup` tells which port was found.
+    PORT_PATTERNS: Dict[str, re.Pattern] = {
+        "florestad": re.compile(
+            r"RPC server is running at [0-9.]+:(?P<rpc>\d+)"
+            r"|Electrum Server is running at [0-9.]+:(?P<electrum_server>\d+)"
+            r"|Electrum TLS Server is running at [0-9.]+:(?P<electrum_server_tls>\d+)"
+        ),
+        "utreexod": re.compile(
+            r"RPCS: RPC server listening on [\d.]+:(?P<rpc>\d+)"
+            r"|CMGR: Server listening on [\d.]+:(?P<p2p>\d+)"
+        ),
+        "bitcoind": re.compile(
+            r"Binding RPC on address [0-9.]+ port (?P<rpc>\d+)"
+            r"|Bound to [0-9.]+:(?P<p2p>\d+)"
+        ),
+    }
+
+    # Rpc and electrum ports are required for florestad while the
+    # tls electrum port is optional. Rpc and p2p ports are required
+    # for utreexod (TODO: add the tls electrum port) and bitcoind.
+    REQUIRED_PORTS: Dict[str, tuple[str, ...]] = {
+        "florestad": ("rpc", "electrum-server"),
+        "utreexod": ("rpc", "p2p"),
+        "bitcoind": ("rpc", "p2p"),
+    }
+
+    # pylint: disable=too-many-locals
     def detect_ports(
         self, mode: str, log_file: TextIO, timeout: int = 180
     ) -> Dict[str, int]:
         """Generic port detector for florestad, utreexod, and bitcoind logs."""
-        required_patterns: Dict[str, re.Pattern]
-        optional_patterns: Dict[str, re.Pattern] = {}
-
-        # Rpc and electrum ports are required for florestad while the
-        # tls electrum port is optional.
-        if mode == "florestad":
-            required_patterns = {
-                "rpc": re.compile(r"RPC server is running at [0-9.]+:(\d+)"),
-                "electrum-server": re.compile(
-                    r"Electrum Server is running at [0-9.]+:(\d+)"
-                ),
-            }
-            optional_patterns = {
-                "electrum-server-tls": re.compile(
-                    r"Electrum TLS Server is running at [0-9.]+:(\d+)"
-                )
-            }
-
-        # Rpc and p2p ports are required for utreexod while the
-        # tls electrum port is optional (TODO: add it).
-        elif mode == "utreexod":
-            required_patterns = {
-                "rpc": re.compile(r".*RPCS: RPC server listening on [\d.]+:(\d+)"),
-                "p2p": re.compile(r".*CMGR: Server listening on [\d.]+:(\d+)"),
-            }
-
-        # The rpc and p2p ports are required for bitcoind
-        elif mode == "bitcoind":
-            required_patterns = {
-                "rpc": re.compile(r"Binding RPC on address [0-9.]+ port (\d+)"),
-                "p2p": re.compile(r"Bound to [0-9.]+:(\d+)"),
-            }
-        else:
+        if mode not in FlorestaTestFramework.PORT_PATTERNS:
             raise ValueError(f"Unsupported mode: {mode}")
 
+        pattern = FlorestaTestFramework.PORT_PATTERNS[mode]
+        required = FlorestaTestFramework.REQUIRED_PORTS[mode]
+        has_optional = len(pattern.groupindex) > len(required)
+
         # Initialize the ports dictionary with None
         # for each required and optional pattern
         ports: Dict[str, int] = {}
@@ -642,41 +754,40 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
         time_tls = None
         tls_period = 0.5
 
-        # Read the log file line by line until we find all required ports
+        # Read the log file line by line until we find all required ports.
+        # While the daemon is not writing, wait with a short backoff (from
+        # 10ms up to 100ms), reset as soon as a new line shows up, so lines
+        # are picked up right after they are written
+        delay = 0.01
         while time.time() - start_time <= timeout:
             line = log_file.readline()
             if not line:
-                time.sleep(0.1)
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
                 continue
 
-            for name, pattern in required_patterns.items():
-                if name not in ports:
-                    match = pattern.search(line)
-                    if match:
-                        ports[name] = int(match.group(1))
-                        self.log(f"Detected {mode} {name} port: {ports[name]}")
+            delay = 0.01
 
-            for name, pattern in optional_patterns.items():
+            match = pattern.search(line)
+            if match:
+                name = match.lastgroup.replace("_", "-")
                 if name not in ports:
-                    match = pattern.search(line)
-                    if match:
-                        ports[name] = int(match.group(1))
-                        self.log(f"Detected {mode} optional {name} port: {ports[name]}")
+                    ports[name] = int(match.group(match.lastgroup))
+                    kind = "" if name in required else "optional "
+                    self.log(f"Detected {mode} {kind}{name} port: {ports[name]}")
 
             # If we find all required ports, we need to wait a little
             # bit to see if there's any TLS port that could have not
-            # found yet
-            if all(name in ports for name in required_patterns):
-                if not optional_patterns:
+            # found yet (unless all of them were already found)
+            if all(name in ports for name in required):
+                if not has_optional or len(ports) == len(pattern.groupindex):
                     return ports
                 if time_tls is None:
                     time_tls = time.time()
                 elif (time.time() - time_tls) >= tls_period:
                     return ports
 
-        raise TimeoutError(
-            f"Timeout waiting for {mode} ports: {list(required_patterns)}"
-        )
+        raise TimeoutError(f"Timeout waiting for {mode} ports: {list(required)}")
 
     def run_node(self, node: Node, timeout: int = 180):
         """
@@ -698,34 +809,70 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
         # Open the log file for reading and detect the RPC port
         log_path = self.get_test_log_path()
 
-        # This could use resource-allocating operations.
-        # But since the log file is created by the parent process
-        # with `open(log_path, "w")` and closed in the parent process,
-        # and we read the file while it is in writing mode,
-        # do not ever call close here
+        # The log file is written by the test process (and the daemons
+        # it spawns) through its own descriptor, so closing this reading
+        # one does not affect the writers.
         #
-        # pylint: disable=R1732
-        log_file = open(log_path, "r", encoding="utf-8")
-
         # Capture the RPC port from the log file
         # This is a workaround for multiple nodes running on
         # multithreaded mode, where the same rpc ports could
         # not be shared.
-        node.rpc_config["ports"] = self.detect_ports(node.variant, log_file)
+        with open(log_path, "r", encoding="utf-8") as log_file:
+            node.rpc_config["ports"] = self.detect_ports(node.variant, log_file)
         self.log(node.rpc_config)
 
         if node.variant == "florestad":
-            node.rpc = FlorestaRPC(node.daemon.process, node.rpc_config)
+            node.rpc = FlorestaRPC(
+                node.daemon.process, node.rpc_config, node.http_session
+            )
 
         if node.variant == "utreexod":
-            node.rpc = UtreexoRPC(node.daemon.process, node.rpc_config)
+            node.rpc = UtreexoRPC(
+                node.daemon.process, node.rpc_config, node.http_session
+            )
 
         if node.variant == "bitcoind":
-            node.rpc = BitcoinRPC(node.daemon.process, node.rpc_config)
+            node.rpc = BitcoinRPC(
+                node.daemon.process, node.rpc_config, node.http_session
+            )
 
         node.rpc.wait_for_connections(opened=True, timeout=timeout)
         self.log(f"Node '{node.variant}' started")
 
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def poll_until(
+        self,
+        predicate: Callable[[], bool],
+        timeout: float = 60,
+        initial: float = 0.05,
+        factor: float = 1.5,
+        cap: float = 1.0,
+    ) -> bool:
+        """
+        Call `predicate` until it returns True or `timeout` seconds have
+        passed, and return whether it was satisfied in time.
+
+        Between calls, wait with an exponential backoff (from `initial`
+        seconds, multiplied by `factor` up to `cap` seconds), so a condition
+        is noticed soon after it is met, without flooding the nodes with
+        requests while it is not. Use it with `assertTrue`, e.g.:
+
+        ```python
+        self.assertTrue(self.poll_until(lambda: node.rpc.get_peerinfo()))
+        ```
+        """
+        deadline = time.time() + timeout
+        delay = initial
+        while not predicate():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+
+            time.sleep(min(delay, remaining))
+            delay = min(delay * factor, cap)
+
+        return True
+
     def stop_node(self, index: int):
         """
         Stop a node given an index on self._tests.
@@ -733,12 +880,48 @@ class FlorestaTestFramework(metaclass=FlorestaTestMetaClass):
         node = self.get_node(index)
         return node.stop()
 
-    def stop(self):
+    @staticmethod
+    def request_stop(node: Node, timeout: float) -> bool:
+        """
+        Ask a running node to stop through RPC and wait until its
+        ports are closed. Return whether the node was running.
+        """
+        if not node.daemon.is_running:
+            return False
+
+        node.rpc.stop()
+
+        # A daemon that hangs with its ports open is killed by `stop`
+        with contextlib.suppress(TimeoutError):
+            node.rpc.wait_for_connections(opened=False, timeout=timeout)
+        return True
+
+    def stop(self, timeout: float = 30):
         """
         Stop all nodes.
+
+        The nodes are asked to stop concurrently and the daemons are
+        reaped together, so the teardown takes as long as the slowest
+        node, instead of the sum of all of them. The daemons that do not
+        exit within `timeout` seconds are killed (see `Node.kill_all`).
         """
-        for i in range(len(self._nodes)):
-            self.stop_node(i)
+        deadline = time.monotonic() + timeout
+        with ThreadPoolExecutor(max_workers=max(1, len(self._nodes))) as executor:
+            running = list(
+                executor.map(lambda node: self.request_stop(node, timeout), self._nodes)
+            )
+
+        stopping = [
+            node for node, was_running in zip(self._nodes, running) if was_running
+        ]
+        try:
+            BaseDaemon.wait_all(
+                [node.daemon for node in stopping],
+                max(0, deadline - time.monotonic()),
+            )
+        except TimeoutExpired:
+            self.log(f"Nodes did not stop in {timeout} seconds, killing them")
+            Node.kill_all(stopping)
 
     # pylint: disable=invalid-name
     def assertTrue(self, condition: bool):
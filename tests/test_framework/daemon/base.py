@@ -7,9 +7,11 @@ regtest mode.
 """
 
 import os
+import select
+import time
 from datetime import datetime, timezone
-from subprocess import Popen
-from typing import List
+from subprocess import Popen, TimeoutExpired
+from typing import List, Optional
 
 
 class BaseDaemonMetaClass(type):
@@ -227,6 +229,70 @@ class BaseDaemon(metaclass=BaseDaemonMetaClass):
         self.process = Popen(cmd, text=True)
         self.log(f"Starting node '{self.name}': {' '.join(cmd)}")
 
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """
+        Wait for the daemon process to exit and return its exit code.
+
+        Raise a `subprocess.TimeoutExpired` if the process does not exit
+        in `timeout` seconds. See `BaseDaemon.wait_all`.
+        """
+        BaseDaemon.wait_all([self], timeout)
+        return self.process.returncode
+
+    @staticmethod
+    def wait_all(daemons: List["BaseDaemon"], timeout: Optional[float] = None):
+        """
+        Wait for all the given daemon processes to exit.
+
+        When available (Linux >= 5.3), the pidfds of all processes are
+        registered in a single `select.poll` and each process is reaped
+        as soon as the kernel reports its exit, instead of relying on the
+        sleep loop that `Popen.wait` does when a timeout is given.
+        Otherwise, fall back to `Popen.wait` on each process.
+
+        Raise a `subprocess.TimeoutExpired` if the processes do not exit
+        in `timeout` seconds, naming every daemon that is still running.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(0, deadline - time.monotonic())
+
+        poller = select.poll() if hasattr(os, "pidfd_open") else None
+        pending = {}
+        try:
+            for daemon in daemons:
+                if daemon.process.poll() is not None:
+                    continue
+
+                try:
+                    pidfd = os.pidfd_open(daemon.process.pid)
+                except (AttributeError, OSError):
+                    daemon.process.wait(timeout=remaining())
+                    continue
+
+                poller.register(pidfd, select.POLLIN)
+                pending[pidfd] = daemon
+
+            while pending:
+                wait_for = remaining()
+                events = poller.poll(None if wait_for is None else wait_for * 1000)
+                if not events:
+                    still_running = ", ".join(
+                        f"{daemon.name} (pid {daemon.process.pid})"
+                        for daemon in pending.values()
+                    )
+                    raise TimeoutExpired(still_running, timeout)
+
+                for pidfd, _ in events:
+                    poller.unregister(pidfd)
+                    daemon = pending.pop(pidfd)
+                    os.close(pidfd)
+                    daemon.process.wait()
+        finally:
+            for pidfd in pending:
+                os.close(pidfd)
+
     def add_daemon_settings(self, settings: List[str]):
         """
         Add node settings to the list of settings.
@@ -239,9 +305,10 @@ class BaseDaemon(metaclass=BaseDaemonMetaClass):
         """
 
         if len(settings) >= 1:
+            valid_args = set(self.valid_daemon_args())
             for extra in settings:
                 option = extra.split("=") if "=" in extra else extra.split(" ")
-                if option[0] in self.valid_daemon_args():
+                if option[0] in valid_args:
                     self.settings.append(extra)
                 else:
                     raise ValueError(f"Invalid extra_arg '{option}'")
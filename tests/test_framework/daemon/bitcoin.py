@@ -113,7 +113,6 @@ class BitcoinDaemon(BaseDaemon):
             "-debug",
             "-debugexclude",
             "-help",
-            "-debug",
             "-logips",
             "-loglevelalways",
             "-logsourcelocations",
@@ -8,16 +8,28 @@ Define a base class for making RPC calls to a
 import json
 import socket
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from subprocess import Popen
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote
 
-from requests import post
+from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 from requests.models import HTTPBasicAuth
 from test_framework.rpc.exceptions import JSONRPCError
 
+# Decode responses with `orjson` if it is installed, since it is
+# much faster than the standard `json` module. It is optional.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Maximum number of calls in a single JSON-RPC batch
+MAX_BATCH_SIZE = 20
+
 
 class BaseRpcMetaClass(type):
     """
@@ -25,9 +37,9 @@ class BaseRpcMetaClass(type):
 
     Ensures that any attempt to register a subclass of `BaseDaemon` will
     adheres to a standard whereby the subclass DOES NOT override either
-    `__init__`, `log`, `perform_request`, `is_connection_open`,
-    `wait_for_connection`, `wait_for_connections`.  But must
-    implement `get_blockchain_info` and `stop`.
+    `__init__`, `log`, `perform_request`, `perform_batch_request`,
+    `is_connection_open`, `wait_for_connection`, `wait_for_connections`.
+    But must implement `get_blockchain_info` and `stop`.
 
     If any of those standards are violated, a ``TypeError`` is raised.
     """
@@ -49,6 +61,7 @@ class BaseRpcMetaClass(type):
                     "__init__",
                     "log",
                     "perform_request",
+                    "perform_batch_request",
                     "is_connection_open",
                     "wait_for_connection",
                     "wait_for_connections",
@@ -56,7 +69,8 @@ class BaseRpcMetaClass(type):
             ):
                 raise TypeError(
                     "BaseRPC subclasses must not override  '__init__', 'log',"
-                    + "'perform_request', 'is_connection_open', "
+                    + "'perform_request', 'perform_batch_request', "
+                    + "'is_connection_open', "
                     + "'wait_for_connection', 'wait_for_connections', "
                     + "'get_blockchain_info' and 'stop'"
                 )
@@ -132,12 +146,27 @@ class BaseRPC(metaclass=BaseRpcMetaClass):
     stop_msg = myrpc.stop()
     """
 
-    def __init__(self, process: Popen[str], rpcserver: Dict[str, str | Dict[str, str]]):
+    def __init__(
+        self,
+        process: Popen[str],
+        rpcserver: Dict[str, str | Dict[str, str]],
+        session: Optional[Session] = None,
+    ):
         self._rpcserver = RPCServerConfig(**rpcserver)
         self._process = process
         self._rpcconn = None
         self._is_running = False
 
+        # Keep a keep-alive connection to the RPC server, so consecutive
+        # requests reuse the same TCP socket instead of doing a new
+        # handshake (and authentication) for each call. The session can
+        # be given by the caller, to be shared with other clients
+        if session is None:
+            session = Session()
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self._session = session
+        self._session.headers["content-type"] = "application/json"
+
     @property
     def rpcconn(self):
         """Getter for `rpcconn` property"""
@@ -206,25 +235,20 @@ class BaseRPC(metaclass=BaseRpcMetaClass):
 
         return logmsg
 
-    # pylint: disable=unused-argument,dangerous-default-value
-    def perform_request(
-        self,
-        method: str,
-        params: List[int | str | float | Dict[str, str | Dict[str, str]]] = [],
-    ) -> Any:
+    def post(self, payload: Any, calls: List[Tuple[str, List[Any]]]) -> Any:
         """
-        Perform a JSON-RPC request to the RPC server given the method
-        and params. The params should be a list of arguments to the
-        method. The method should be a string with the name of the
-        method to be called.
+        POST a JSON-RPC payload (a single request or a batch of them)
+        to the RPC server and return its decoded JSON response. The
+        `calls` are the `(method, params)` pairs in the payload and
+        are only used for logging.
 
-        The method will return the result of the request or raise
-        a JSONRPCError if the request failed.
+        Raise an HTTPError if the response status isnt 200.
         """
         # Create basic information for the requests
-        # inside the `kwargs` dictionary
+        # inside the `kwargs` dictionary (the headers
+        # are the same for every request, so they are
+        # already set in the session)
         # - url
-        # - headers
         # - data (payload)
         # - timeout
         host = getattr(self.rpcserver, "host")
@@ -232,56 +256,131 @@ class BaseRPC(metaclass=BaseRpcMetaClass):
         rpc_port = ports["rpc"]
         user = getattr(self.rpcserver, "user")
         password = getattr(self.rpcserver, "password")
-        jsonrpc_version = getattr(self.rpcserver, "jsonrpc_version")
         timeout = getattr(self.rpcserver, "timeout")
         kwargs = {
             "url": f"http://{host}:{rpc_port}/",
-            "headers": {"content-type": "application/json"},
-            "data": json.dumps(
-                {
-                    "jsonrpc": jsonrpc_version,
-                    "id": "0",
-                    "method": method,
-                    "params": params,
-                }
-            ),
+            "data": json.dumps(payload, separators=(",", ":")),
             "timeout": timeout,
         }
 
         # Check if the RPC server has a username and password
         # and set the auth accordingly to HTTPBasicAuth.
-        logmsg = "GET "
         if user is not None or password is not None:
-            logmsg += f"<{user}:{password}>@"
             kwargs["auth"] = HTTPBasicAuth(user, password)
 
         # Now make the POST request to the RPC server
-        logmsg = BaseRPC.build_log_message(
-            kwargs["url"], method, params, user, password
-        )
+        for method, params in calls:
+            logmsg = BaseRPC.build_log_message(
+                kwargs["url"], method, params, user, password
+            )
+            self.log(logmsg)
 
-        self.log(logmsg)
-        response = post(**kwargs)
+        response = self._session.post(**kwargs)
 
         # If response isnt 200, raise an HTTPError
         if response.status_code != 200:
             raise HTTPError
 
-        result = response.json()
+        return json_loads(response.content)
+
+    @staticmethod
+    def raise_for_error(result: Dict[str, Any]):
+        """
+        Raise a JSONRPCError if a JSON-RPC response has a non-null error.
+        """
         # Error could be None or a str
         # If in the future this change,
         # cast the resulted error to str
         if "error" in result and result["error"] is not None:
             raise JSONRPCError(
                 data=result["error"] if isinstance(result["error"], str) else None,
-                rpc_id=result["id"],
+                rpc_id=result.get("id"),
                 code=result["error"]["code"],
                 message=result["error"]["message"],
             )
 
+    # pylint: disable=unused-argument,dangerous-default-value
+    def perform_request(
+        self,
+        method: str,
+        params: List[int | str | float | Dict[str, str | Dict[str, str]]] = [],
+    ) -> Any:
+        """
+        Perform a JSON-RPC request to the RPC server given the method
+        and params. The params should be a list of arguments to the
+        method. The method should be a string with the name of the
+        method to be called.
+
+        The method will return the result of the request or raise
+        a JSONRPCError if the request failed.
+        """
+        jsonrpc_version = getattr(self.rpcserver, "jsonrpc_version")
+        payload = {
+            "jsonrpc": jsonrpc_version,
+            "id": "0",
+            "method": method,
+            "params": params,
+        }
+
+        result = self.post(payload, [(method, params)])
+        BaseRPC.raise_for_error(result)
+
         self.log(result["result"])
         return result["result"]
 
+    def perform_batch_request(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """
+        Perform many JSON-RPC requests in a single HTTP request (a JSON-RPC
+        batch), given a list of `(method, params)` tuples. The results are
+        returned in the same order of the calls.
+
+        The server must support batches (bitcoind and utreexod do, florestad
+        does not). A batch is limited to `MAX_BATCH_SIZE` calls, so the server
+        does not need to buffer huge responses.
+
+        The method will raise a JSONRPCError if any of the requests failed.
+        """
+        if not calls or len(calls) > MAX_BATCH_SIZE:
+            raise ValueError(
+                f"A batch must have between 1 and {MAX_BATCH_SIZE} calls, got {len(calls)}"
+            )
+
+        jsonrpc_version = getattr(self.rpcserver, "jsonrpc_version")
+        payload = [
+            {
+                "jsonrpc": jsonrpc_version,
+                "id": i,
+                "method": method,
+                "params": params,
+            }
+            for i, (method, params) in enumerate(calls)
+        ]
+
+        response = self.post(payload, calls)
+
+        # A server that can not parse the batch answers it
+        # with a single error object, instead of a list
+        if not isinstance(response, list):
+            BaseRPC.raise_for_error(response)
+            raise JSONRPCError(
+                rpc_id=None,
+                code=None,
+                data=str(response),
+                message="Expected a list of responses to a batch request",
+            )
+
+        # Check the errors before sorting, since invalid requests
+        # are answered with a null id. The server may answer the
+        # batch in any order
+        for result in response:
+            BaseRPC.raise_for_error(result)
+
+        results = [
+            result["result"] for result in sorted(response, key=lambda r: r["id"])
+        ]
+        self.log(results)
+        return results
+
     def is_connection_open(self, host: str, port: int) -> bool:
         """Returns True if a TCP port is open (connection succeeded)."""
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
@@ -296,23 +395,44 @@ class BaseRPC(metaclass=BaseRpcMetaClass):
         Wait for the RPC connection to reach the desired state.
         If the connection does not reach the desired state in time,
         raise a TimeoutError.
+
+        The port is probed with an exponential backoff (starting at
+        10ms and capped at 250ms), so a daemon that is ready within a
+        few hundred milliseconds is detected right away.
         """
         start = time.time()
+        delay = 0.01
         while time.time() - start < timeout:
             if self.is_connection_open(host, port) == opened:
                 state = "open" if opened else "closed"
                 self.log(f"{host}:{port} {state}")
                 return
-            time.sleep(0.5)
+            time.sleep(delay)
+            delay = min(delay * 1.7, 0.25)
 
         state = "open" if opened else "closed"
         raise TimeoutError(f"{host}:{port} not {state} after {timeout} seconds")
 
     def wait_for_connections(self, opened: bool = True, timeout: int = 180):
-        """Wait for all port connections in the host reach the desired state."""
+        """
+        Wait for all port connections in the host reach the desired state.
+
+        Every port is waited concurrently, so the total time is bounded by
+        the slowest port instead of the sum of all of them.
+        """
         host = getattr(self.rpcserver, "host")
-        for _, port in getattr(self.rpcserver, "ports").items():
-            self.log(
-                f"Waiting for {host}:{port} to be {'open' if opened else 'closed'}"
-            )
-            self.wait_for_connection(host, port, opened, timeout)
+        ports = list(getattr(self.rpcserver, "ports").values())
+        state = "open" if opened else "closed"
+
+        with ThreadPoolExecutor(max_workers=max(1, len(ports))) as executor:
+            futures = []
+            for port in ports:
+                self.log(f"Waiting for {host}:{port} to be {state}")
+                futures.append(
+                    executor.submit(
+                        self.wait_for_connection, host, port, opened, timeout
+                    )
+                )
+
+            for future in futures:
+                future.result()
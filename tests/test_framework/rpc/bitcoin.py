@@ -16,6 +16,11 @@ REGTEST_RPC_SERVER = {
     "timeout": 10000,
 }
 
+# Same address used as `--miningaddr` in the utreexod tests.
+# Using a fixed address avoids the need for a loaded wallet (and
+# one `getnewaddress` call) whenever blocks need to be mined.
+REGTEST_MINING_ADDRESS = "bcrt1q4gfcga7jfjmm02zpvrh4ttc5k7lmnq2re52z2y"
+
 
 class BitcoinRPC(BaseRPC):
     """
@@ -28,6 +33,14 @@ class BitcoinRPC(BaseRPC):
         """
         return self.perform_request("getblockchaininfo")
 
+    def generate(self, blocks: int, address: str = REGTEST_MINING_ADDRESS) -> list:
+        """
+        Mine `blocks` blocks to `address` in a single call, performing
+        `perform_request('generatetoaddress', params=[<int>, <str>])`,
+        and return their hashes.
+        """
+        return self.perform_request("generatetoaddress", [blocks, address])
+
     def get_blockhash(self, height: int) -> dict:
         """
         Get the blockhash associated with a given height performing